@@ -1,524 +1,749 @@
-import simpy
-import numpy as np
-np.random.seed(42)
-
-def generate_customer(env, TOTAL_CUSTOMERS, INTERVAL):
-    """
-    A process function that creates customers at fixed intervals (INTERVAL) within the simulation environment.
-    This function generates a new customer in the SimPy environment (env) every INTERVAL time units,
-    and stops after producing a total of TOTAL_CUSTOMERS.
-    Args:
-        TOTAL_CUSTOMERS (int): The total number of customers to generate.
-        INTERVAL (float): The time interval (in simulation time units) between successive customer creations.
-
-    Yields:
-        simpy.Event: A SimPy timeout event that pauses the process for INTERVAL time units.
-            After INTERVAL has passed, a new customer is generated and the loop continues.
-    """
-    print('#########################New_Process_Start#####################################')
-    for i in range(TOTAL_CUSTOMERS):
-        customer_name = i
-        customer_has_blueprint = np.random.randint(0, 2)
-        env.process(recept_customer(env, customer_name, reception_desk, customer_has_blueprint))
-        yield env.timeout(np.random.exponential(INTERVAL))
-
-def recept_customer(env, customer_name, reception_desk, customer_has_blueprint):
-    """
-    A process function that handles a customer going through the reception desk and then moving to the next step in the SimPy environment.
-
-    This function records the customer's arrival, makes them wait for the reception desk resource,
-    checks if their wait time exceeds a specified limit (in which case they leave),
-    and if they are served, it simulates service time and then directs the customer to create a blueprint
-    if they do not have one, or to the printing process if they already have a blueprint.
-
-
-    Args:
-        customer_name (str): The customer's identifier
-        reception_desk (simpy.Resource): The SimPy Resource object representing the reception desk.
-        customer_has_blueprint (int): A flag indicating whether the customer has a blueprint (0 or 1).
-
-    Yields:
-        env (simpy.Environment): The SimPy simulation environment.
-            Used to track current simulation time for arrival and wait calculations,
-            and to create timeout events for service delays.
-        customer_name (str): The customer's identifier (name or ID).
-            Passed as a unique string for printing messages and subsequent process calls.
-        reception_desk (simpy.Resource): The SimPy Resource object representing the reception desk.
-            Configured with capacity=1, so customers queue and are served one at a time.
-        customer_has_blueprint (int): A flag indicating whether the customer has a blueprint (0 or 1).
-            If 0, the function calls the create_blueprint process;
-            if 1, it proceeds directly to the printing_process.
-    """
-    customer_arrive_time = env.now
-    print("# Enter Process 0 Time {:.2f} # Customer {} arrived at {:.2f}".format(env.now, customer_name, customer_arrive_time))
-
-    with reception_desk.request() as req:
-        yield req
-        customer_wait_time = env.now - customer_arrive_time
-        customer_wait_limit = 500
-        if customer_wait_time > customer_wait_limit:
-            print("# Fail Process 0 Time {:.2f} # Customer {} leave".format(env.now, customer_name))
-        else:
-            if customer_wait_time != 0:
-                print('# Proceed Process 0 Time {:.2f} # Customer {}  wait. during {:.2f}'.format(env.now, customer_name, customer_wait_time))
-            service_time = np.random.triangular(3, 6, 9)
-            yield env.timeout(service_time)
-            if customer_has_blueprint == 0:
-                yield env.process(create_blueprint(env, customer_name, blueprint_station))
-            else:
-                printer_type = np.random.randint(0, 2)
-                print('# finish Process 0 Time {:.2f} # Customer {}'.format(env.now, customer_name))
-                yield env.process(printing_process(env, customer_name, printer_type))
-                
-
-def create_blueprint(env, customer_name, blueprint_station):
-    """
-    A process function that handles a customer’s blueprint creation.
-
-    Args:
-        customer_name (str): Identifier for the customer.
-        blueprint_station (simpy.Resource): The SimPy Resource representing the blueprint creation station.
-
-    Yields:
-        simpy.Event:
-            1) `yield req` waits for the blueprint_station request event until the station is available.
-            2) `yield env.timeout(process_time)` pauses for the sampled creation time to complete the blueprint.
-            3) After printing the completion message, `yield env.process(printing_process(...))` suspends
-               this process while the printing process runs.
-    """
-    process_time = np.random.triangular(4, 10, 15)
-    with blueprint_station.request() as req:
-        yield req
-        yield env.timeout(process_time)
-        print('# finish Process 0 Time {:.2f} # Customer {} complete blueprint creation.'.format(env.now, customer_name))
-    printer_type = np.random.randint(0, 2)
-    yield env.process(printing_process(env, customer_name, printer_type))
-
-def printing_process(env, customer_name, printer_type):
-    """
-    A function that, within the simulation environment, selects the first available printer 
-    (either FDM or SLA based on the given printer_type), performs the printing job on that printer, 
-    and then proceeds to the quality inspection (qc_team.inspect) process.
-
-    Args:
-        customer_name (str): Identifier for the customer.
-        printer_type (int): Flag indicating the type of printer (0 for FDM, 1 for SLA).
-
-    Yields:
-        simpy.events.AnyOf: Waits for the first available printer resource among two requests.
-        simpy.Event: The event returned by `env.process(selected_printer.print(...))`, which completes when printing is done.
-        simpy.Event: The event returned by `env.process(qc_team.inspect(...))`, which completes when quality inspection is done.
-        
-
-    Process Steps:
-        1. If printer_type is 0, request the two FDM printers (fdm_printer_1, fdm_printer_2); 
-           otherwise, request the two SLA printers (sla_printer_1, sla_printer_2).
-        2. Use simpy.events.AnyOf to choose whichever printer becomes available first, 
-           and cancel the other request.
-        3. Call `yield env.process(selected_printer.print(customer_name))` to execute the printing job 
-           on the selected printer.
-        4. After printing is complete, release the printer resource with 
-           `selected_printer.resource.release(selected_req)`.
-        5. Next, invoke the `qc_team.inspect` process to carry out the quality inspection.
-        6. Once all tasks are done, print a message indicating that printing and inspection are complete.
-    """
-    if printer_type == 0:
-        req1 = fdm_printer_1.resource.request()
-        req2 = fdm_printer_2.resource.request()
-        result = yield simpy.events.AnyOf(env, [req1, req2])
-
-        if req1 in result:
-            selected_printer = fdm_printer_1
-            selected_req = req1
-            req2.cancel()
-        else:
-            selected_printer = fdm_printer_2
-            selected_req = req2
-            req1.cancel()
-
-    else:
-        req1 = sla_printer_1.resource.request()
-        req2 = sla_printer_2.resource.request()
-        result = yield simpy.events.AnyOf(env, [req1, req2])
-
-        if req1 in result:
-            selected_printer = sla_printer_1
-            selected_req = req1
-            req2.cancel()
-        else:
-            selected_printer = sla_printer_2
-            selected_req = req2
-            req1.cancel()
-
-    print("# enter Process 1 Time {:.2f} # Customer {} dispatched to {}"
-          .format(env.now, customer_name, selected_printer.__class__.__name__))
-
-    yield env.process(selected_printer.print(customer_name))
-
-    selected_printer.resource.release(selected_req)
-    
-    yield env.process(qc_team.inspect(customer_name, printer_type))
-
-#-----------------------------------------------------
-class Printer:
-    """
-    An abstract class defining the basic functions common to printers used in the simulation environment.
-    """
-    def __init__(self, env):
-        self.env=env
-
-        
-        
-class FDMPrinter_1(Printer):   
-    """    
-    A class modeling the first FDM (Fused Deposition Modeling) printer.
-
-    Attributes:
-        resource (simpy.Resource): A SimPy Resource object representing FDMPrinter_1 (capacity=1).
-    """
-    def __init__(self, env):
-        super().__init__(env)
-        self.resource=simpy.Resource(env,capacity=1)
-        
-    def print(self, customer_name):
-        """
-        A process method that carries out a 3D printing job for a customer.
-
-        1. Determines the required amount of plastic (needed_plastic) using a triangular distribution 
-           (min=1g, mode=2g, max=3g).
-        2. Determines the printing time (print_time_FDM1) using a triangular distribution 
-           (min=8 minutes, mode=10 minutes, max=20 minutes).
-        3. Prints a message including the current simulation time (env.now), customer name, and plastic usage.
-        4. Calls the use_material.get_plastic process to obtain the required plastic amount.
-        5. Waits for the specified print_time, then prints a completion message.
-
-        Args:
-            customer_name (str): The identifier for customer
-
-        Yields:
-            simpy.Event: Sequentially waits for use_material.get_plastic and env.timeout events, 
-            then signals that printing is complete.
-        """
-        needed_plastic = np.random.triangular(1, 2, 3)
-        print_time_FDM1=np.random.triangular(8,10,20)
-        print("# proceed Process 1 Time {:.2f} # Customer {}'s product use plastic {:2f}g".format(self.env.now, customer_name, needed_plastic))
-        yield self.env.process(use_material.get_plastic(customer_name, needed_plastic))
-        yield self.env.timeout(print_time_FDM1)
-        print("# finish Process 1 Time {:.2f} # Customer {}'s product is finished printing".format(self.env.now, customer_name))
-
-
-class FDMPrinter_2(Printer):
-    """    
-    A class modeling the second FDM (Fused Deposition Modeling) printer.
-
-    Attributes:
-        resource (simpy.Resource): A SimPy Resource object representing FDMPrinter_2 (capacity=1).
-    """
-    def __init__(self, env):
-        super().__init__(env)
-        self.resource=simpy.Resource(env,capacity=1)
-        
-    def print(self, customer_name):
-        """
-        A process method that carries out a 3D printing job for a customer.
-
-        1. Determines the required amount of plastic (needed_plastic) using a triangular distribution 
-           (min=1g, mode=2g, max=3g).
-        2. Determines the printing time (print_time_FDM2) using a triangular distribution 
-           (min=8 minutes, mode=14 minutes, max=20 minutes).
-        3. Prints a message including the current simulation time (env.now), customer name, and plastic usage.
-        4. Calls the use_material.get_plastic process to obtain the required plastic amount.
-        5. Waits for the specified print_time, then prints a completion message.
-
-        Args:
-            customer_name (str): The identifier for customer.
-
-        Yields:
-            simpy.Event: Sequentially waits for use_material.get_plastic and env.timeout events, 
-            then signals that printing is complete.
-        """
-        needed_plastic = np.random.triangular(1, 2, 3)
-        print_time_FDM2=np.random.triangular(8,14,20)
-        print("# proceed Process 1 Time {:.2f} # Customer {}'s product use plastic {:2f}".format(self.env.now, customer_name, needed_plastic))
-        yield self.env.process(use_material.get_plastic(customer_name, needed_plastic))
-        yield self.env.timeout(print_time_FDM2)
-        print("# finish Process 1 Time {:.2f} # Customer {}'s product is finished printing".format(self.env.now, customer_name))
-
-class SLAPrinter_1(Printer):
-    """
-    A class modeling the first SLA (Stereolithography) printer.
-
-    Attributes:
-        env (simpy.Environment): The SimPy simulation environment.
-        resource (simpy.Resource): A SimPy Resource object representing this printer (capacity=1).
-    """ 
-    def __init__(self, env):
-        super().__init__(env)
-        self.resource=simpy.Resource(env,capacity=1)
-        
-    def print(self, customer_name):
-        """
-        A process method that carries out an SLA printing job for a customer.
-
-        1. Determines the required amount of resin (needed_resin) using a triangular distribution 
-           (min=1ml, mode=2ml, max=3ml).
-        2. Determines the printing time (print_time_SLA1) using a triangular distribution 
-           (min=8 minutes, mode=10 minutes, max=20 minutes).
-        3. Prints a message including the current simulation time (env.now), customer name, and resin usage.
-        4. Calls the use_material.get_resin process to obtain the required resin amount.
-        5. Waits for the specified print_time, then prints a completion message.
-
-        Args:
-            customer_name (str): The identifier for customer.
-
-        Yields:
-            simpy.Event: Sequentially waits for use_material.get_resin and env.timeout events,
-                         then signals that printing is complete.
-        """
-        needed_resin = np.random.triangular(1,2,3)
-        print_time_SLA1=np.random.triangular(8,10,20)
-        print("# proceed Process 1 Time {:.2f} # Customer {}'s product use resin {:2f}ml".format(self.env.now, customer_name, needed_resin))
-        yield self.env.process(use_material.get_resin(customer_name, needed_resin))
-        yield self.env.timeout(print_time_SLA1)
-        print("# finish Process 1 Time {:.2f} # Customer {}'s product is finished printing".format(self.env.now, customer_name))
-
-
-class SLAPrinter_2(Printer):   
-    def __init__(self, env):
-        super().__init__(env)
-        self.resource=simpy.Resource(env,capacity=1)
-        
-    def print(self, customer_name):
-        """
-        A process method that carries out an SLA printing job for a customer.
-
-        1. Determines the required amount of resin (needed_resin) using a triangular distribution 
-           (min=1ml, mode=2ml, max=3ml).
-        2. Determines the printing time (print_time_SLA2) using a triangular distribution 
-           (min=8 minutes, mode=15 minutes, max=20 minutes).
-        3. Prints a message including the current simulation time (env.now), customer name, and resin usage.
-        4. Calls the use_material.get_resin process to obtain the required resin amount.
-        5. Waits for the specified print_time, then prints a completion message.
-
-        Args:
-            customer_name (str): The identifier for customer.
-
-        Yields:
-            simpy.Event: Sequentially waits for use_material.get_resin and env.timeout events,
-                         then signals that printing is complete.
-        """
-        needed_resin = np.random.triangular(1,2,3)
-        print_time_SLA2=np.random.triangular(8,15,20)
-        print("# proceed Process 1 Time {:.2f} # Customer {}'s product use resin {:2f}ml".format(self.env.now, customer_name, needed_resin))
-        yield self.env.process(use_material.get_resin(customer_name, needed_resin))
-        yield self.env.timeout(print_time_SLA2)
-        print("# finish Process 1 Time {:.2f} # Customer {}'s product is finished printing".format(self.env.now, customer_name))
-
-#------------------------------------------------
-
-class MaterialStock:
-    """
-    A class for managing material stocks.
-
-    This class handles plastic and resin containers, providing the requested amounts to customers,
-    or initiating a refill process if the requested amount exceeds current stock.
-    """
-    def __init__(self, env):
-        self.env = env
-
-    def get_plastic(self,customer_name, customer_needed_amount):
-        """
-        A process method that withdraws the requested amount of plastic from the container.
-
-        1. If the plastic_container has at least customer_needed_amount, it withdraws immediately.
-        2. If not enough stock is available, it prints a shortage message and calls refill_plastic.
-        3. After refilling is complete, it withdraws the requested amount of plastic.
-
-        Args:
-            customer_name (str): The name or ID of the customer requesting the plastic.
-            customer_needed_amount (float): The amount of plastic (in grams) needed by the customer.
-
-        Yields:
-            simpy.Event:
-                - `plastic_container.get(customer_needed_amount)`: waits for plastic withdrawal.
-                - `env.process(self.refill_plastic())`: waits for the refill process if stock is insufficient.
-        """
-        if plastic_container.level >= customer_needed_amount:
-            yield plastic_container.get(customer_needed_amount)
-        else:
-            print("## Lack plastic to make Customer {}'s product ##".format(customer_name))
-            yield self.env.process(self.refill_plastic())
-            yield plastic_container.get(customer_needed_amount)
-
-    def refill_plastic(self):
-        """
-        A process method that refills the plastic_container to its full capacity.
-
-        1. Calculates refill_amount as (capacity - current level).
-        2. Waits for the estimated refill time (refill_amount * 0.1), then puts refill_amount into the container.
-
-        Yields:
-            simpy.Event:
-                - `env.timeout(refill_amount * 0.1)`: waits for the refill duration.
-                - `plastic_container.put(refill_amount)`: waits for the refill action to complete.
-        """
-        refill_amount=plastic_container.capacity-plastic_container.level
-        print("## Refill by{:.2f}, Estimate time{:.2f} ##".format(refill_amount,refill_amount*0.1))
-        yield self.env.timeout(refill_amount*0.1)
-        yield plastic_container.put(refill_amount)
-
-    def get_resin(self,customer_name, customer_needed_amount):
-        """
-        A process method that withdraws the requested amount of resin from the container.
-
-        1. If the resin_container has at least customer_needed_amount, it withdraws immediately.
-        2. If not enough stock is available, it prints a shortage message and calls refill_resin.
-        3. After refilling is complete, it withdraws the requested amount of resin.
-
-        Args:
-            customer_name (str): The name or ID of the customer requesting the resin.
-            customer_needed_amount (float): The amount of resin (in milliliters) needed by the customer.
-
-        Yields:
-            simpy.Event:
-                - `resin_container.get(customer_needed_amount)`: waits for resin withdrawal.
-                - `env.process(self.refill_resin())`: waits for the refill process if stock is insufficient.
-        """
-        if resin_container.level >= customer_needed_amount:
-            yield resin_container.get(customer_needed_amount)
-        else:
-            print("## Lack plastic to make Customer {}'s product ##".format(customer_name))
-            yield self.env.process(self.refill_resin())
-            yield resin_container.get(customer_needed_amount)
-
-    def refill_resin(self):
-        """
-        A process method that refills the resin_container to its full capacity.
-
-        1. Calculates refill_amount as (capacity - current level).
-        2. Waits for the estimated refill time (refill_amount * 0.1), then puts refill_amount into the container.
-
-        Yields:
-            simpy.Event:
-                - `env.timeout(refill_amount * 0.1)`: waits for the refill duration.
-                - `resin_container.put(refill_amount)`: waits for the refill action to complete.
-        """
-        refill_amount=resin_container.capacity-resin_container.level
-        print("## Refill by{:.2f}, Estimate time{:.2f} ##".format(refill_amount,refill_amount*0.1))
-        yield self.env.timeout(refill_amount*0.1)
-        yield resin_container.put(refill_amount)
-
-#------------------------------------------
-
-class QualityControl:
-    def __init__(self, env):
-        self.env = env
-
-    def inspect(self, customer_name, printer_type):
-        """
-        A process method that performs quality control on a customer's printed product.
-
-        1. Requests the qc_resource to begin inspection.
-        2. Prints a message indicating that the product has entered quality control, 
-           including the current simulation time and customer name.
-        3. Samples an inspection time from a uniform distribution between 1 and 3 time units.
-        4. Waits for the inspection_time to simulate the QC process.
-        5. With a 5% chance, the product fails QC:
-           a. Prints a failure message with the current time and customer name.
-           b. Re-enters the printing process (printing_process) using the same printer_type.
-        6. Otherwise, the product passes QC:
-           a. Prints a pass message with the current time and customer name.
-           b. Proceeds to the packaging process (packaging_team.package).
-        
-        Args:
-            customer_name (str): The name or ID of the customer whose product is being inspected.
-            printer_type (int): The type of printer used (0 for FDM, 1 for SLA), 
-                                used to determine reprint behavior on failure.
-
-        Yields:
-            simpy.events.AnyOf / simpy.Event:
-                - `qc_resource.request()`: waits for the quality control resource to become available.
-                - `env.timeout(inspection_time)`: simulates the inspection duration.
-                - On failure: `env.process(printing_process(...))` waits for the reprint process to complete.
-                - On success: `env.process(packaging_team.package(...))` waits for the packaging process to complete.
-        """
-        with qc_resource.request() as req:
-            yield req
-            print("# enter process2 Time {:.2f} # customer's product {} enters Quality Control"
-                  .format(self.env.now, customer_name))
-            inspection_time = np.random.uniform(1, 3)
-            yield self.env.timeout(inspection_time)
-
-            if np.random.rand() < 0.05:
-                print("# fail Process 2 reenter process1 # Time {:.2f} # customer's product {} failed QC"
-                      .format(self.env.now, customer_name))
-                # On QC failure, re-enter the printing process with the same printer_type
-                yield self.env.process(printing_process(self.env, customer_name, printer_type))
-            else:
-                print("# finish Process 2 Time {:.2f} # customer's product {} passed QC"
-                      .format(self.env.now, customer_name))
-                # On success, proceed to packaging
-                yield self.env.process(packaging_team.package(customer_name))
-
-
-# -------------------------------------------------
-class PackagingStation:
-    def __init__(self, env):
-        self.env = env
-
-    def package(self, customer_name):
-        """
-        A process method that packages a customer's product.
-
-        1. Requests the packaging_resource to begin packaging.
-        2. Prints a message indicating that the product has started packaging, 
-           including the current simulation time and customer name.
-        3. Samples a packaging time from a triangular distribution with parameters (2, 3, 5).
-        4. Waits for the pack_time to simulate the packaging process.
-        5. Prints a completion message with the current time and customer name.
-
-        Args:
-            customer_name (str): The name or ID of the customer whose product is being packaged.
-
-        Yields:
-            simpy.events.AnyOf / simpy.Event:
-                - `packaging_resource.request()`: waits for the packaging station to become available.
-                - `env.timeout(pack_time)`: simulates the duration of the packaging process.
-        """
-        with packaging_resource.request() as req:
-            yield req
-            pack_time = np.random.triangular(2, 3, 5)
-            print("# Enter process 3 Time {:.2f} # customer's product {} starts packaging"
-                  .format(self.env.now, customer_name))
-            yield self.env.timeout(pack_time)
-            print("# finish process 3 Time {:.2f} # customer's product {} completed packaging"
-                  .format(self.env.now, customer_name))
-
-
-# ---------------------------------------------------------------------------------------
-
-env=simpy.Environment()
-reception_desk=simpy.Resource(env, capacity=1)
-blueprint_station=simpy.Resource(env, capacity=2)
-
-
-
-fdm_printer_1=FDMPrinter_1(env)
-fdm_printer_2=FDMPrinter_2(env)
-sla_printer_1=SLAPrinter_1(env)
-sla_printer_2=SLAPrinter_2(env)
-
-use_material=MaterialStock(env)
-plastic_container=simpy.Container(env,init=20,capacity=1000)
-resin_container=simpy.Container(env,init=20,capacity=1000)
-
-qc_resource = simpy.Resource(env, capacity=2)
-qc_team=QualityControl(env)
-
-packaging_resource = simpy.Resource(env, capacity=2)
-packaging_team=PackagingStation(env)
-
-
-
-env.process(generate_customer(env, TOTAL_CUSTOMERS=20, INTERVAL=15))
-env.run()
\ No newline at end of file
+import collections
+import functools
+import multiprocessing
+import os
+import sys
+
+import simpy
+import numpy as np
+
+from rng_utils import SquaresRNG, VariatePool
+
+# Every event is recorded as a (t, ev, cust, x) row of a structured NumPy array; replicate
+# statistics are computed from it with vectorized NumPy once the run is over. The rows are
+# formatted and written to stdout only when VERBOSE is set.
+VERBOSE = False
+
+LOG_DTYPE = np.dtype([('t', 'f8'), ('ev', 'u1'), ('cust', 'i4'), ('x', 'f8')])
+EV_START = 0
+EV_ARRIVE = 1
+EV_LEAVE = 2
+EV_WAIT = 3
+EV_RECEPTION_DONE = 4
+EV_BLUEPRINT_DONE = 5
+EV_DISPATCH = 6
+EV_USE_PLASTIC = 7
+EV_USE_RESIN = 8
+EV_PRINT_DONE = 9
+EV_LACK_PLASTIC = 10
+EV_LACK_RESIN = 11
+EV_REFILL = 12
+EV_QC_ENTER = 13
+EV_QC_FAIL = 14
+EV_SCRAP = 15
+EV_QC_PASS = 16
+EV_PACK_START = 17
+EV_PACK_DONE = 18
+
+# Reprints allowed after a failed QC before the product is scrapped.
+MAX_RETRIES = 3
+
+# A printer that has to withdraw material also withdraws it for up to MATERIAL_LOOKAHEAD - 1
+# jobs queued on its pool, in one container get.
+MATERIAL_LOOKAHEAD = 4
+
+# Per-customer decisions are hashed from (seed, stream, index) with SquaresRNG.words/word, so a
+# customer's blueprint flag, printer type and QC outcomes do not shift when other draws change.
+# The blueprint flag and printer type are the top bit of the customer's word, hashed for all
+# customers up front; a QC outcome is hashed per inspection from customer_name * (MAX_RETRIES + 1) + attempt.
+BLUEPRINT_STREAM = 0
+PRINTER_STREAM = 1
+QC_STREAM = 2
+QC_FAIL_THRESHOLD = int(0.05 * 2 ** 64)
+
+# (kind, material triangular, print time triangular, name) of each printer of the farm. A printer's
+# position in this tuple is the index recorded in the event log when a job is dispatched to it.
+PRINTERS = (
+    ('FDM', (1, 2, 3), (8, 10, 20), 'FDMPrinter_1'),
+    ('FDM', (1, 2, 3), (8, 14, 20), 'FDMPrinter_2'),
+    ('SLA', (1, 2, 3), (8, 10, 20), 'SLAPrinter_1'),
+    ('SLA', (1, 2, 3), (8, 15, 20), 'SLAPrinter_2'),
+)
+
+_START_BANNER = '#########################New_Process_Start#####################################'
+
+# One pre-built f-string formatter per event code, called as formatter(now, name, extra).
+_MESSAGES = {
+    EV_START: lambda now, name, extra: _START_BANNER,
+    EV_ARRIVE: lambda now, name, extra: f"# Enter Process 0 Time {now:.2f} # Customer {name} arrived at {now:.2f}",
+    EV_LEAVE: lambda now, name, extra: f"# Fail Process 0 Time {now:.2f} # Customer {name} leave",
+    EV_WAIT: lambda now, name, extra: f"# Proceed Process 0 Time {now:.2f} # Customer {name}  wait. during {extra:.2f}",
+    EV_RECEPTION_DONE: lambda now, name, extra: f"# finish Process 0 Time {now:.2f} # Customer {name}",
+    EV_BLUEPRINT_DONE: lambda now, name, extra: f"# finish Process 0 Time {now:.2f} # Customer {name} complete blueprint creation.",
+    EV_DISPATCH: lambda now, name, extra: f"# enter Process 1 Time {now:.2f} # Customer {name} dispatched to {PRINTERS[int(extra)][3]}",
+    EV_USE_PLASTIC: lambda now, name, extra: f"# proceed Process 1 Time {now:.2f} # Customer {name}'s product use plastic {extra:2f}g",
+    EV_USE_RESIN: lambda now, name, extra: f"# proceed Process 1 Time {now:.2f} # Customer {name}'s product use resin {extra:2f}ml",
+    EV_PRINT_DONE: lambda now, name, extra: f"# finish Process 1 Time {now:.2f} # Customer {name}'s product is finished printing",
+    EV_LACK_PLASTIC: lambda now, name, extra: f"## Lack plastic to make Customer {name}'s product ##",
+    EV_LACK_RESIN: lambda now, name, extra: f"## Lack resin to make Customer {name}'s product ##",
+    EV_REFILL: lambda now, name, extra: f"## Refill by{extra:.2f}, Estimate time{extra*0.1:.2f} ##",
+    EV_QC_ENTER: lambda now, name, extra: f"# enter process2 Time {now:.2f} # customer's product {name} enters Quality Control",
+    EV_QC_FAIL: lambda now, name, extra: f"# fail Process 2 reenter process1 # Time {now:.2f} # customer's product {name} failed QC",
+    EV_SCRAP: lambda now, name, extra: f"# fail Process 2 Time {now:.2f} # customer's product {name} failed QC and is scrapped",
+    EV_QC_PASS: lambda now, name, extra: f"# finish Process 2 Time {now:.2f} # customer's product {name} passed QC",
+    EV_PACK_START: lambda now, name, extra: f"# Enter process 3 Time {now:.2f} # customer's product {name} starts packaging",
+    EV_PACK_DONE: lambda now, name, extra: f"# finish process 3 Time {now:.2f} # customer's product {name} completed packaging",
+}
+
+
+def flush_log(log):
+    """
+    Formats the recorded events and writes them to stdout with a single call.
+
+    Args:
+        log (np.ndarray): Rows of LOG_DTYPE.
+    """
+    sys.stdout.writelines(_MESSAGES[event](now, customer_name, extra) + '\n'
+                          for now, event, customer_name, extra in log.tolist())
+
+
+def generate_customer(farm, TOTAL_CUSTOMERS, INTERVAL):
+    """
+    A process function that creates customers at fixed intervals (INTERVAL) within the simulation environment.
+    This function generates a new customer in the SimPy environment (farm.env) every INTERVAL time units,
+    and stops after producing a total of TOTAL_CUSTOMERS.
+    Args:
+        farm (Farm): The farm of the running replicate.
+        TOTAL_CUSTOMERS (int): The total number of customers to generate.
+        INTERVAL (float): The time interval (in simulation time units) between successive customer creations.
+
+    All interarrival times are drawn up front as one NumPy array, so each loop iteration only
+    indexes into it.
+
+    Yields:
+        simpy.Event: A SimPy timeout event that pauses the process for INTERVAL time units.
+            After INTERVAL has passed, a new customer is generated and the loop continues.
+    """
+    env = farm.env
+    farm.record(env.now, EV_START)
+    interarrivals = farm.rng.exponential(INTERVAL, TOTAL_CUSTOMERS).tolist()
+    for i in range(TOTAL_CUSTOMERS):
+        customer_name = i
+        env.process(recept_customer(farm, customer_name))
+        yield env.timeout(interarrivals[i])
+
+def recept_customer(farm, customer_name):
+    """
+    A process function that handles a customer going through the reception desk and then moving to the next step in the SimPy environment.
+
+    This function records the customer's arrival, makes them wait for the farm's reception desk resource,
+    checks if their wait time exceeds a specified limit (in which case they leave),
+    and if they are served, it simulates service time and then directs the customer to create a blueprint
+    if they do not have one, or to the printing process if they already have a blueprint.
+
+
+    Args:
+        farm (Farm): The farm of the running replicate. Its reception_desk is configured with capacity=1,
+            so customers queue and are served one at a time, and its has_blueprint flag (0 or 1) decides
+            whether the customer goes to create_blueprint (0) or directly to printing_process (1).
+        customer_name (str): The customer's identifier (name or ID).
+            Passed as a unique string for trace messages and subsequent process calls.
+
+    Yields:
+        simpy.Event:
+            1) `yield req` waits for the reception desk to become available.
+            2) `yield env.timeout(service_time)` pauses for the sampled service time.
+            3) `yield from create_blueprint(...)` or `yield from printing_process(...)` delegates to
+               the customer's next step.
+    """
+    env = farm.env
+    customer_arrive_time = env.now
+    farm.record(env.now, EV_ARRIVE, customer_name)
+
+    # Sample before requesting the desk, like the other stations.
+    service_time = farm.service_time[customer_name]
+    with farm.reception_desk.request() as req:
+        yield req
+        customer_wait_time = env.now - customer_arrive_time
+        customer_wait_limit = 500
+        if customer_wait_time > customer_wait_limit:
+            farm.record(env.now, EV_LEAVE, customer_name)
+        else:
+            if customer_wait_time != 0:
+                farm.record(env.now, EV_WAIT, customer_name, customer_wait_time)
+            yield env.timeout(service_time)
+            if farm.has_blueprint[customer_name] == 0:
+                yield from create_blueprint(farm, customer_name)
+            else:
+                farm.record(env.now, EV_RECEPTION_DONE, customer_name)
+                yield from printing_process(farm, customer_name)
+
+
+def create_blueprint(farm, customer_name):
+    """
+    A process function that handles a customer’s blueprint creation at the farm's blueprint_station.
+
+    Args:
+        farm (Farm): The farm of the running replicate.
+        customer_name (str): Identifier for the customer.
+
+    Yields:
+        simpy.Event:
+            1) `yield req` waits for the blueprint_station request event until the station is available.
+            2) `yield env.timeout(process_time)` pauses for the sampled creation time to complete the blueprint.
+            3) After logging the completion message, `yield from printing_process(...)` delegates to
+               this process while the printing process runs.
+    """
+    env = farm.env
+    process_time = farm.blueprint_time[customer_name]
+    with farm.blueprint_station.request() as req:
+        yield req
+        yield env.timeout(process_time)
+        farm.record(env.now, EV_BLUEPRINT_DONE, customer_name)
+    yield from printing_process(farm, customer_name)
+
+def printing_process(farm, customer_name):
+    """
+    A function that, within the simulation environment, selects the fastest idle printer 
+    of the customer's pool (the FDM or SLA printers, chosen by farm.printer_type), performs the printing
+    job on that printer, and then proceeds to the quality inspection (farm.qc_team.inspect) process.
+    A product that fails QC is reprinted on the same pool, at most MAX_RETRIES times;
+    after that it is scrapped.
+
+    Args:
+        farm (Farm): The farm of the running replicate.
+        customer_name (str): Identifier for the customer.
+
+    Yields:
+        simpy.resources.store.StoreGet: Waits until a printer of the pool is idle and takes it.
+        simpy.Event: The events of `selected_printer.print(...)`, delegated with `yield from` until printing is done.
+        simpy.Event: The events of `farm.qc_team.inspect(...)`, delegated with `yield from` until quality inspection is done.
+        simpy.Event: The events of `farm.packaging_team.package(...)` once the product passes QC.
+
+    Process Steps:
+        1. Take the idle printer with the shortest expected print time out of the pool with `pool.get()`; 
+           the pool is a PriorityStore of the printers keyed by their expected print time, so each
+           printer serves a single job at a time.
+        2. Call `yield from selected_printer.print(customer_name, lookahead)` to execute the printing job 
+           on the selected printer, where lookahead is the number of jobs still queued on the pool
+           (at most MATERIAL_LOOKAHEAD - 1) whose material may be withdrawn together with this job's.
+        3. After printing is complete, return the printer to the pool with `pool.put(...)`.
+        4. Next, invoke the `farm.qc_team.inspect` process to carry out the quality inspection.
+        5. If the product passed, package it with `farm.packaging_team.package`. Otherwise log the failure
+           and go back to step 1, or scrap the product once MAX_RETRIES reprints have failed.
+    """
+    env = farm.env
+    pool = farm.printer_pools[farm.printer_type[customer_name]]
+    for attempt in range(MAX_RETRIES + 1):
+        pool_item = yield pool.get()
+        selected_printer = pool_item.item
+
+        farm.record(env.now, EV_DISPATCH, customer_name, selected_printer.index)
+
+        lookahead = min(len(pool.get_queue), MATERIAL_LOOKAHEAD - 1)
+        yield from selected_printer.print(customer_name, lookahead)
+
+        yield pool.put(pool_item)
+
+        if (yield from farm.qc_team.inspect(customer_name, attempt)):
+            yield from farm.packaging_team.package(customer_name)
+            return
+        if attempt < MAX_RETRIES:
+            farm.record(env.now, EV_QC_FAIL, customer_name)
+
+    farm.record(env.now, EV_SCRAP, customer_name)
+
+#-----------------------------------------------------
+class Printer3D:
+    """
+    A class modeling one 3D printer of the farm; FDM (Fused Deposition Modeling) printers consume plastic
+    and SLA (Stereolithography) printers consume resin.
+
+    Attributes:
+        farm (Farm): The farm the printer belongs to.
+        env (simpy.Environment): The SimPy simulation environment.
+        kind (str): 'FDM' or 'SLA'.
+        mat_tri (tuple): (min, mode, max) of the triangular material usage (g of plastic or ml of resin).
+        time_tri (tuple): (min, mode, max) of the triangular printing time in minutes.
+        name (str): The printer's name used in trace messages.
+        index (int): The printer's position in PRINTERS, recorded in the event log on dispatch.
+        material_pool (VariatePool): The farm's pool of mat_tri material usages, shared by the printers of the same material.
+        print_time_pool (VariatePool): The farm's pool of this printer's time_tri printing times.
+        expected_print_time (float): Mean of time_tri, used to prefer faster printers when several are idle.
+    """
+    __slots__ = ('farm', 'env', 'kind', 'mat_tri', 'time_tri', 'name', 'index', 'material_pool', 'print_time_pool')
+
+    def __init__(self, farm, kind, mat, time, name):
+        self.farm=farm
+        self.env=farm.env
+        self.kind=kind
+        self.mat_tri=mat
+        self.time_tri=time
+        self.name=name
+        self.index=-1
+        self.material_pool=farm.variate_pool('plastic' if kind == 'FDM' else 'resin', 'triangular', *mat)
+        self.print_time_pool=farm.variate_pool(f'{name}.print_time', 'triangular', *time)
+
+    @property
+    def expected_print_time(self):
+        return sum(self.time_tri) / 3
+
+    def print(self, customer_name, lookahead=0):
+        """
+        A process method that carries out a 3D printing job for a customer.
+
+        1. If material was already withdrawn by an earlier job of the same material, takes the oldest
+           amount from farm.use_material's prefetched queue without touching the container. The queue is a
+           reserve shared by all printers of that material: the amounts are not tied to the jobs that
+           were queued when they were withdrawn, but are consumed by whichever jobs print next.
+        2. Otherwise takes the required amounts of material for this job and the next `lookahead` jobs
+           from material_pool,
+           withdraws them with a single farm.use_material.get_plastic_batch (FDM) or get_resin_batch (SLA),
+           and queues the amounts of the upcoming jobs as prefetched.
+        3. Logs a message including the current simulation time (env.now), customer name, and material usage.
+        4. Waits for the printing time, drawn from this printer's own print_time_pool,
+           then logs a completion message.
+
+        Args:
+            customer_name (str): The identifier for customer.
+            lookahead (int): The number of queued jobs to withdraw material for along with this one.
+
+        Yields:
+            simpy.Event: Sequentially waits for the material withdrawal and env.timeout events, 
+            then signals that printing is complete.
+        """
+        farm = self.farm
+        use_material = farm.use_material
+        if self.kind == 'FDM':
+            prefetched = use_material.plastic_prefetched
+            get_batch = use_material.get_plastic_batch
+            event = EV_USE_PLASTIC
+        else:
+            prefetched = use_material.resin_prefetched
+            get_batch = use_material.get_resin_batch
+            event = EV_USE_RESIN
+
+        if prefetched:
+            amounts = None
+            needed_material = prefetched.popleft()
+        else:
+            material_pool = self.material_pool
+            amounts = [next(material_pool) for _ in range(1 + lookahead)]
+            needed_material = amounts[0]
+        print_time = next(self.print_time_pool)
+
+        farm.record(self.env.now, event, customer_name, needed_material)
+        if amounts is not None:
+            yield from get_batch(customer_name, amounts)
+            prefetched.extend(amounts[1:])
+        yield self.env.timeout(print_time)
+        farm.record(self.env.now, EV_PRINT_DONE, customer_name)
+
+#------------------------------------------------
+
+class MaterialStock:
+    """
+    A class for managing material stocks.
+
+    This class handles plastic and resin containers, providing the requested amounts to customers,
+    or initiating a refill process if the requested amount exceeds current stock.
+    Refills of each material are serialized by a capacity-1 lock, so a shortage seen by several
+    customers at once triggers a single refill.
+
+    Attributes:
+        farm (Farm): The farm the stock belongs to.
+        env (simpy.Environment): The SimPy simulation environment.
+        plastic_container (simpy.Container): Plastic stock in grams, starting at 20 of a 1000 capacity.
+        resin_container (simpy.Container): Resin stock in milliliters, starting at 20 of a 1000 capacity.
+        plastic_prefetched (collections.deque): Plastic amounts already withdrawn for upcoming FDM jobs,
+            consumed first-in first-out by the next FDM jobs on any printer.
+        resin_prefetched (collections.deque): Resin amounts already withdrawn for upcoming SLA jobs,
+            consumed first-in first-out by the next SLA jobs on any printer.
+    """
+    __slots__ = ('farm', 'env', 'plastic_container', 'resin_container',
+                 '_plastic_refill_lock', '_resin_refill_lock', 'plastic_prefetched', 'resin_prefetched')
+
+    def __init__(self, farm):
+        self.farm = farm
+        self.env = env = farm.env
+        self.plastic_container = simpy.Container(env, init=20, capacity=1000)
+        self.resin_container = simpy.Container(env, init=20, capacity=1000)
+        self._plastic_refill_lock = simpy.Resource(env, capacity=1)
+        self._resin_refill_lock = simpy.Resource(env, capacity=1)
+        self.plastic_prefetched = collections.deque()
+        self.resin_prefetched = collections.deque()
+
+    def get_plastic(self,customer_name, customer_needed_amount):
+        """
+        A process method that withdraws the requested amount of plastic from the container.
+
+        1. If the plastic_container has at least customer_needed_amount, it withdraws immediately.
+        2. If not enough stock is available, it logs a shortage message and takes the plastic refill lock.
+           Holding the lock, it calls refill_plastic only if the stock is still short, since a customer
+           that held the lock before may already have refilled the container.
+        3. After refilling is complete, it withdraws the requested amount of plastic.
+
+        Args:
+            customer_name (str): The name or ID of the customer requesting the plastic.
+            customer_needed_amount (float): The amount of plastic (in grams) needed by the customer.
+
+        Yields:
+            simpy.Event:
+                - `plastic_container.get(customer_needed_amount)`: waits for plastic withdrawal.
+                - `self._plastic_refill_lock.request()`: waits until no other refill of plastic is in progress.
+                - `yield from self.refill_plastic()`: delegates to the refill process if stock is insufficient.
+        """
+        if self.plastic_container.level >= customer_needed_amount:
+            yield self.plastic_container.get(customer_needed_amount)
+        else:
+            self.farm.record(self.env.now, EV_LACK_PLASTIC, customer_name)
+            with self._plastic_refill_lock.request() as req:
+                yield req
+                if self.plastic_container.level < customer_needed_amount:
+                    yield from self.refill_plastic()
+            yield self.plastic_container.get(customer_needed_amount)
+
+    def get_plastic_batch(self, customer_name, amounts):
+        """
+        A process method that withdraws the plastic for several FDM jobs with a single container get.
+
+        Args:
+            customer_name (str): The name or ID of the customer whose job triggers the withdrawal.
+            amounts (list): The amounts of plastic (in grams) needed by this job and the upcoming jobs.
+
+        Yields:
+            simpy.Event: The events of `get_plastic` for the summed amount.
+        """
+        yield from self.get_plastic(customer_name, sum(amounts))
+
+    def refill_plastic(self):
+        """
+        A process method that refills the plastic_container to its full capacity.
+
+        1. Calculates refill_amount as (capacity - current level).
+        2. Waits for the estimated refill time (refill_amount * 0.1), then puts refill_amount into the container.
+
+        Yields:
+            simpy.Event:
+                - `env.timeout(refill_amount * 0.1)`: waits for the refill duration.
+                - `plastic_container.put(refill_amount)`: waits for the refill action to complete.
+        """
+        refill_amount=self.plastic_container.capacity-self.plastic_container.level
+        self.farm.record(self.env.now, EV_REFILL, -1, refill_amount)
+        yield self.env.timeout(refill_amount*0.1)
+        yield self.plastic_container.put(refill_amount)
+
+    def get_resin(self,customer_name, customer_needed_amount):
+        """
+        A process method that withdraws the requested amount of resin from the container.
+
+        1. If the resin_container has at least customer_needed_amount, it withdraws immediately.
+        2. If not enough stock is available, it logs a shortage message and takes the resin refill lock.
+           Holding the lock, it calls refill_resin only if the stock is still short, since a customer
+           that held the lock before may already have refilled the container.
+        3. After refilling is complete, it withdraws the requested amount of resin.
+
+        Args:
+            customer_name (str): The name or ID of the customer requesting the resin.
+            customer_needed_amount (float): The amount of resin (in milliliters) needed by the customer.
+
+        Yields:
+            simpy.Event:
+                - `resin_container.get(customer_needed_amount)`: waits for resin withdrawal.
+                - `self._resin_refill_lock.request()`: waits until no other refill of resin is in progress.
+                - `yield from self.refill_resin()`: delegates to the refill process if stock is insufficient.
+        """
+        if self.resin_container.level >= customer_needed_amount:
+            yield self.resin_container.get(customer_needed_amount)
+        else:
+            self.farm.record(self.env.now, EV_LACK_RESIN, customer_name)
+            with self._resin_refill_lock.request() as req:
+                yield req
+                if self.resin_container.level < customer_needed_amount:
+                    yield from self.refill_resin()
+            yield self.resin_container.get(customer_needed_amount)
+
+    def get_resin_batch(self, customer_name, amounts):
+        """
+        A process method that withdraws the resin for several SLA jobs with a single container get.
+
+        Args:
+            customer_name (str): The name or ID of the customer whose job triggers the withdrawal.
+            amounts (list): The amounts of resin (in milliliters) needed by this job and the upcoming jobs.
+
+        Yields:
+            simpy.Event: The events of `get_resin` for the summed amount.
+        """
+        yield from self.get_resin(customer_name, sum(amounts))
+
+    def refill_resin(self):
+        """
+        A process method that refills the resin_container to its full capacity.
+
+        1. Calculates refill_amount as (capacity - current level).
+        2. Waits for the estimated refill time (refill_amount * 0.1), then puts refill_amount into the container.
+
+        Yields:
+            simpy.Event:
+                - `env.timeout(refill_amount * 0.1)`: waits for the refill duration.
+                - `resin_container.put(refill_amount)`: waits for the refill action to complete.
+        """
+        refill_amount=self.resin_container.capacity-self.resin_container.level
+        self.farm.record(self.env.now, EV_REFILL, -1, refill_amount)
+        yield self.env.timeout(refill_amount*0.1)
+        yield self.resin_container.put(refill_amount)
+
+#------------------------------------------
+
+class QualityControl:
+    __slots__ = ('farm', 'env', 'inspection_time_pool')
+
+    def __init__(self, farm):
+        self.farm = farm
+        self.env = farm.env
+        self.inspection_time_pool = farm.variate_pool('qc.inspection_time', 'uniform', 1, 3)
+
+    def inspect(self, customer_name, attempt):
+        """
+        A process method that performs quality control on a customer's printed product.
+
+        1. Samples an inspection time from a uniform distribution between 1 and 3 time units,
+           and the QC outcome, before requesting the station.
+        2. Requests the farm's qc_resource to begin inspection.
+        3. Logs a message indicating that the product has entered quality control, 
+           including the current simulation time and customer name.
+        4. Waits for the inspection_time to simulate the QC process.
+        5. With a 5% chance, decided by hashing (customer_name, attempt) on QC_STREAM and comparing
+           the word against QC_FAIL_THRESHOLD, the product fails QC; otherwise it passes and a pass message is logged.
+           Reprinting or packaging is left to the caller (printing_process), once the station is released.
+        
+        Args:
+            customer_name (str): The name or ID of the customer whose product is being inspected.
+            attempt (int): 0 for the first print of the product, n for its n-th reprint.
+
+        Yields:
+            simpy.events.AnyOf / simpy.Event:
+                - `qc_resource.request()`: waits for the quality control resource to become available.
+                - `env.timeout(inspection_time)`: simulates the inspection duration.
+
+        Returns:
+            bool: True if the product passed QC.
+        """
+        farm = self.farm
+        inspection_time = next(self.inspection_time_pool)
+        failed = farm.rng.word(QC_STREAM, customer_name * (MAX_RETRIES + 1) + attempt) < QC_FAIL_THRESHOLD
+        with farm.qc_resource.request() as req:
+            yield req
+            farm.record(self.env.now, EV_QC_ENTER, customer_name)
+            yield self.env.timeout(inspection_time)
+        if not failed:
+            farm.record(self.env.now, EV_QC_PASS, customer_name)
+        return not failed
+
+
+# -------------------------------------------------
+class PackagingStation:
+    __slots__ = ('farm', 'env')
+
+    def __init__(self, farm):
+        self.farm = farm
+        self.env = farm.env
+
+    def package(self, customer_name):
+        """
+        A process method that packages a customer's product.
+
+        1. Samples a packaging time from a triangular distribution with parameters (2, 3, 5).
+        2. Requests the farm's packaging_resource to begin packaging.
+        3. Logs a message indicating that the product has started packaging, 
+           including the current simulation time and customer name.
+        4. Waits for the pack_time to simulate the packaging process.
+        5. Logs a completion message with the current time and customer name.
+
+        Args:
+            customer_name (str): The name or ID of the customer whose product is being packaged.
+
+        Yields:
+            simpy.events.AnyOf / simpy.Event:
+                - `packaging_resource.request()`: waits for the packaging station to become available.
+                - `env.timeout(pack_time)`: simulates the duration of the packaging process.
+        """
+        farm = self.farm
+        pack_time = farm.pack_time[customer_name]
+        with farm.packaging_resource.request() as req:
+            yield req
+            farm.record(self.env.now, EV_PACK_START, customer_name)
+            yield self.env.timeout(pack_time)
+            farm.record(self.env.now, EV_PACK_DONE, customer_name)
+
+
+# ---------------------------------------------------------------------------------------
+
+class Farm:
+    """
+    One replicate of the 3D printing farm: its environment, random generator, event log and stations.
+
+    The process functions and station classes reach everything they share through the farm they are
+    given, so several farms can be built and run in the same process without interfering.
+
+    Attributes:
+        env (simpy.Environment): The SimPy simulation environment.
+        rng (SquaresRNG): The generator of every variate of this replicate.
+        log (np.ndarray): The event log, of LOG_DTYPE rows; only the first log_size rows are recorded.
+        log_size (int): The number of recorded events.
+        service_time, blueprint_time, pack_time (list): Per-customer variates, indexed by customer_name.
+        has_blueprint, printer_type (list): Per-customer 0/1 decisions, indexed by customer_name.
+        reception_desk (simpy.Resource): The capacity-1 reception desk.
+        blueprint_station (simpy.Resource): The capacity-2 blueprint creation station.
+        printers (list): The Printer3D of every entry of PRINTERS, in the same order.
+        printer_pools (tuple): The idle FDM and SLA printers as (fdm_pool, sla_pool), indexed by printer type.
+        use_material (MaterialStock): The plastic and resin stock.
+        qc_resource (simpy.Resource): The capacity-2 quality control station.
+        qc_team (QualityControl): The quality control team.
+        packaging_resource (simpy.Resource): The capacity-2 packaging station.
+        packaging_team (PackagingStation): The packaging team.
+    """
+    __slots__ = ('env', 'rng', 'log', 'log_size', '_pools',
+                 'service_time', 'blueprint_time', 'pack_time', 'has_blueprint', 'printer_type',
+                 'reception_desk', 'blueprint_station', 'printers', 'printer_pools',
+                 'use_material', 'qc_resource', 'qc_team', 'packaging_resource', 'packaging_team')
+
+    def __init__(self, seed, total_customers):
+        self.env = env = simpy.Environment()
+        self.rng = rng = SquaresRNG(seed)
+        self.log = np.empty(max(1, total_customers * 10), dtype=LOG_DTYPE)
+        self.log_size = 0
+        self._pools = {}
+
+        # Per-customer variates are indexed by customer_name. Per-job variates (QC failures cause
+        # reprints, so their count is not known up front) come from the lazily refilled variate pools.
+        self.service_time = rng.triangular(3, 6, 9, total_customers).tolist()
+        self.blueprint_time = rng.triangular(4, 10, 15, total_customers).tolist()
+        self.pack_time = rng.triangular(2, 3, 5, total_customers).tolist()
+        self.has_blueprint = (rng.words(BLUEPRINT_STREAM, total_customers) >> np.uint64(63)).tolist()
+        self.printer_type = (rng.words(PRINTER_STREAM, total_customers) >> np.uint64(63)).tolist()
+
+        self.reception_desk=simpy.Resource(env, capacity=1)
+        self.blueprint_station=simpy.Resource(env, capacity=2)
+
+        self.printers=[Printer3D(self, kind, mat=mat, time=time, name=name) for kind, mat, time, name in PRINTERS]
+        for index, printer in enumerate(self.printers):
+            printer.index = index
+
+        # Idle printers are handed out fastest-first: shortest-expected-job dispatch between printers.
+        pools = []
+        for kind in ('FDM', 'SLA'):
+            printers = [p for p in self.printers if p.kind == kind]
+            pool = simpy.PriorityStore(env, capacity=len(printers))
+            pool.items = sorted(simpy.PriorityItem(p.expected_print_time, p) for p in printers)
+            pools.append(pool)
+        self.printer_pools = tuple(pools)
+
+        self.use_material=MaterialStock(self)
+
+        self.qc_resource = simpy.Resource(env, capacity=2)
+        self.qc_team=QualityControl(self)
+
+        self.packaging_resource = simpy.Resource(env, capacity=2)
+        self.packaging_team=PackagingStation(self)
+
+    def record(self, now, event, customer_name=-1, extra=0.0):
+        """
+        Appends one event to the log, doubling its storage when full.
+
+        Args:
+            now (float): The simulation time of the event.
+            event (int): One of the EV_* event codes.
+            customer_name (int): The customer the event is about, or -1.
+            extra (float): Event-specific value (wait time, material amount, printer index, refill amount).
+        """
+        if self.log_size == len(self.log):
+            self.log = np.concatenate((self.log, np.empty_like(self.log)))
+        self.log[self.log_size] = (now, event, customer_name, extra)
+        self.log_size += 1
+
+    def variate_pool(self, stream, dist, *params):
+        """
+        Returns the lazily refilled pool of `<dist>(*params, size)` variates of the named stream.
+
+        Each pool draws from its own counter range, spawned from rng by the full (stream, dist, params)
+        key, so its variates do not depend on which pools were used first or how often, and two parameter
+        sets on the same stream name read independent uniforms.
+
+        Args:
+            stream (str): Name of the stream, e.g. 'FDMPrinter_1.print_time' or 'plastic'.
+            dist (str): Name of the SquaresRNG sampling method ('triangular', 'uniform', 'random').
+            *params: The distribution parameters passed before the sample size.
+
+        Returns:
+            VariatePool: An iterator yielding one variate per next() call.
+        """
+        key = (stream, dist) + params
+        pool = self._pools.get(key)
+        if pool is None:
+            # Parameters are spelled as floats, matching the dict key, in which 2 == 2.0.
+            name = '/'.join((stream, dist) + tuple(repr(float(p)) for p in params))
+            pool = self._pools[key] = VariatePool(functools.partial(getattr(self.rng.spawn(name), dist), *params))
+        return pool
+
+
+# ---------------------------------------------------------------------------------------
+
+TOTAL_CUSTOMERS = 20
+INTERVAL = 15
+SEED = 42
+
+
+def run_replicate(seed, total_customers, interval):
+    """
+    Builds a fresh farm, runs one replicate of the simulation to completion and returns its statistics.
+
+    Args:
+        seed (int): Seed of the SquaresRNG used for every variate of this replicate.
+        total_customers (int): The total number of customers to generate.
+        interval (float): The mean interarrival time between customers.
+
+    Returns:
+        dict: seed, customers, completed, left (customers who gave up at reception), scrapped,
+              mean_system_time (arrival to end of packaging) and makespan.
+    """
+    farm = Farm(seed, total_customers)
+    env = farm.env
+    env.process(generate_customer(farm, TOTAL_CUSTOMERS=total_customers, INTERVAL=interval))
+    env.run()
+    log = farm.log[:farm.log_size]
+    if VERBOSE:
+        flush_log(log)
+
+    event = log['ev']
+    arrivals = log[event == EV_ARRIVE]
+    arrive_time = np.zeros(total_customers)
+    arrive_time[arrivals['cust']] = arrivals['t']
+    packed = log[event == EV_PACK_DONE]
+    system_time = packed['t'] - arrive_time[packed['cust']]
+    return {
+        'seed': seed,
+        'customers': total_customers,
+        'completed': len(system_time),
+        'left': int(np.count_nonzero(event == EV_LEAVE)),
+        'scrapped': int(np.count_nonzero(event == EV_SCRAP)),
+        'mean_system_time': float(system_time.mean()) if len(system_time) else 0.0,
+        'makespan': env.now,
+    }
+
+
+def print_summary(result):
+    """
+    Prints the one-line summary of a replicate returned by run_replicate.
+
+    Args:
+        result (dict): The statistics of one replicate.
+    """
+    print(f"## Replicate seed {result['seed']} # completed {result['completed']}/{result['customers']}, "
+          f"left {result['left']}, scrapped {result['scrapped']}, mean system time {result['mean_system_time']:.2f}, "
+          f"makespan {result['makespan']:.2f} ##")
+
+
+if __name__ == '__main__':
+    # Usage: python 3D_printing_Farm_for_codingtest.py [REPLICATES]
+    replicates = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    if replicates < 1:
+        sys.exit("usage: 3D_printing_Farm_for_codingtest.py [REPLICATES], REPLICATES must be at least 1")
+    run = functools.partial(run_replicate, total_customers=TOTAL_CUSTOMERS, interval=INTERVAL)
+    if replicates == 1:
+        # A single replicate runs in-process; starting a worker would only add overhead.
+        print_summary(run(SEED))
+    else:
+        with multiprocessing.Pool(processes=min(replicates, os.cpu_count() or 1)) as pool:
+            for result in pool.imap_unordered(run, range(SEED, SEED + replicates)):
+                print_summary(result)
@@ -0,0 +1,195 @@
+"""
+Random-variate helpers for the 3D printing farm simulation.
+
+Variates are drawn in bulk from the Squares counter-based generator and turned into
+the model's distributions by inverse-CDF transforms. The kernels are compiled with
+Numba when it is installed and run as plain NumPy otherwise; either way they give
+bit-identical results, which is why expov (log1p) is never compiled.
+"""
+import hashlib
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+SQUARES_KEY = 0xc58efd154ce32f6d
+WORD_KEY = 0x9e3779b97f4a7c15
+_MASK64 = (1 << 64) - 1
+_HALF = np.uint64(32)
+_MANTISSA_SHIFT = np.uint64(11)
+
+
+@njit(cache=True)
+def squares64(ctr, key):
+    """
+    Squares counter-based RNG (Widynski, 2020) returning one uint64 per counter.
+
+    Works element-wise on uint64 NumPy arrays; multiplication wraps modulo 2**64.
+
+    Args:
+        ctr (np.ndarray): uint64 counters, one output per counter.
+        key (np.uint64): The generator key.
+
+    Returns:
+        np.ndarray: uint64 random words.
+    """
+    x = y = ctr * key
+    z = y + key
+    x = x * x + y
+    x = (x >> _HALF) | (x << _HALF)
+    x = x * x + z
+    x = (x >> _HALF) | (x << _HALF)
+    x = x * x + y
+    x = (x >> _HALF) | (x << _HALF)
+    t = x = x * x + z
+    x = (x >> _HALF) | (x << _HALF)
+    return t ^ ((x * x + y) >> _HALF)
+
+
+def squares64_int(ctr, key):
+    """Scalar squares64 on Python ints, for single hashed draws outside the bulk pools."""
+    x = y = (ctr * key) & _MASK64
+    z = (y + key) & _MASK64
+    x = (x * x + y) & _MASK64
+    x = ((x >> 32) | (x << 32)) & _MASK64
+    x = (x * x + z) & _MASK64
+    x = ((x >> 32) | (x << 32)) & _MASK64
+    x = (x * x + y) & _MASK64
+    x = ((x >> 32) | (x << 32)) & _MASK64
+    t = x = (x * x + z) & _MASK64
+    x = ((x >> 32) | (x << 32)) & _MASK64
+    return t ^ (((x * x + y) & _MASK64) >> 32)
+
+
+@njit(cache=True)
+def u01(words):
+    """Uniform floats in [0, 1) built from the top 53 bits of each uint64 word."""
+    return (words >> _MANTISSA_SHIFT) * 2.0 ** -53
+
+
+@njit(cache=True)
+def tri(a, b, c, u):
+    """Inverse CDF of the triangular distribution (min=a, mode=b, max=c) at u."""
+    split = (b - a) / (c - a)
+    return np.where(u < split,
+                    a + np.sqrt(u * (c - a) * (b - a)),
+                    c - np.sqrt((1 - u) * (c - a) * (c - b)))
+
+
+@njit(cache=True)
+def uni(a, b, u):
+    """Inverse CDF of the uniform distribution on [a, b) at u."""
+    return a + (b - a) * u
+
+
+def expov(mean, u):
+    """
+    Inverse CDF of the exponential distribution with the given mean at u.
+
+    Left uncompiled: Numba's log1p differs from NumPy's in the last bits, so a compiled
+    kernel would make seeded results depend on whether Numba is installed.
+    """
+    return -mean * np.log1p(-u)
+
+
+class SquaresRNG:
+    """
+    A counter-based generator exposing the subset of the numpy Generator API used by the simulation.
+
+    Each seed owns the counter range [seed * 2**32, (seed + 1) * 2**32), and every call
+    consumes the next `size` counters, so draws hold no hidden state besides one integer.
+    Generators returned by spawn(name) start from a counter base hashed from (seed, name)
+    instead, so each named stream is fixed no matter when it is first used.
+    """
+    def __init__(self, seed, counter=None):
+        self.seed = seed
+        self.key = np.uint64(SQUARES_KEY)
+        self.counter = seed << 32 if counter is None else counter
+        self._word_bases = {}
+
+    def spawn(self, name):
+        """
+        A generator for the named stream, drawing from its own range of 2**32 counters.
+
+        The range starts at a base taken from a BLAKE2 digest of (seed, name), so it depends
+        neither on the order in which streams are spawned nor on Python's randomized hash().
+
+        Args:
+            name (str): Identifier of the stream, e.g. 'FDMPrinter_1.print_time'.
+        """
+        digest = hashlib.blake2b(f'{self.seed}/{name}'.encode(), digest_size=4).digest()
+        return SquaresRNG(self.seed, int.from_bytes(digest, 'little') << 32)
+
+    def _word_base(self, stream):
+        """The first word counter of a stream: a multiple of 2**32 hashed from (seed, stream), computed once."""
+        base = self._word_bases.get(stream)
+        if base is None:
+            base = squares64_int(squares64_int(self.seed, WORD_KEY) ^ stream, WORD_KEY) >> 32 << 32
+            self._word_bases[stream] = base
+        return base
+
+    def word(self, stream, index):
+        """
+        One uint64 (as a Python int) that depends only on (seed, stream, index).
+
+        Unlike the bulk draws it consumes no counters, so the same entity (e.g. a customer's
+        n-th QC inspection) sees the same word whatever else the replicate draws. Each stream
+        reads its own range of 2**32 counters from a base hashed from (seed, stream), so any
+        seed and stream are allowed and only the index is bounded.
+
+        Args:
+            stream (int): Identifier of the decision being made.
+            index (int): The entity the decision is about (below 2**32).
+        """
+        return squares64_int(self._word_base(stream) + index, WORD_KEY)
+
+    def words(self, stream, size):
+        """The words of indices 0 .. size - 1 of a stream as a uint64 array, equal to word(stream, index)."""
+        base = self._word_base(stream)
+        return squares64(np.arange(base, base + size, dtype=np.uint64), np.uint64(WORD_KEY))
+
+    def _u64(self, size):
+        ctr = np.arange(self.counter, self.counter + size, dtype=np.uint64)
+        self.counter += size
+        return squares64(ctr, self.key)
+
+    def random(self, size):
+        return u01(self._u64(size))
+
+    def uniform(self, low, high, size):
+        return uni(low, high, self.random(size))
+
+    def exponential(self, scale, size):
+        return expov(scale, self.random(size))
+
+    def triangular(self, left, mode, right, size):
+        return tri(left, mode, right, self.random(size))
+
+
+class VariatePool:
+    """
+    An iterator over variates drawn `size` at a time by `draw(size)`.
+
+    Each refill is one vectorized draw; the pool redraws lazily when it runs out,
+    so callers never need to know in advance how many variates they will consume.
+    """
+    def __init__(self, draw, size=4096):
+        self.draw = draw
+        self.size = size
+        self._values = iter(())
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self._values)
+        except StopIteration:
+            self._values = iter(self.draw(self.size).tolist())
+            return next(self._values)